@@ -1,20 +1,36 @@
 import argparse
-from scraping import scrape_imdb_top_250
+from scraping import scrape_imdb_top_250, scrape_charts, CHARTS, IMDB_BASE_URL
 from preprocessing import load_and_clean_data
 import analysis
 import visualization
 
 def main():
-    parser = argparse.ArgumentParser(description="IMDb Top 250 Movies Pipeline")
+    parser = argparse.ArgumentParser(description="IMDb Charts Pipeline (Top 250 and batch chart scraping)")
     parser.add_argument('--scrape', action='store_true', help="Scrape IMDb Top 250")
+    parser.add_argument('--batch', action='store_true', help="Scrape the registered charts (Top 250, Top TV, Most Popular, Bottom 100, genres) concurrently into one dataset")
+    parser.add_argument('--charts', nargs='+', choices=sorted(CHARTS), help="Charts to include in --batch (default: all)")
+    parser.add_argument('--base-url', help=f"Base URL for --batch (default: {IMDB_BASE_URL})")
     parser.add_argument('--analyze', action='store_true', help="Analyze the data")
     parser.add_argument('--visualize', action='store_true', help="Generate visualizations")
     args = parser.parse_args()
 
+    if (args.charts or args.base_url) and not args.batch:
+        parser.error("--charts and --base-url require --batch")
+
     if args.scrape:
         print("Starting scraping...")
         scrape_imdb_top_250()
 
+    if args.batch:
+        print("Starting batch scraping...")
+        _, stats = scrape_charts(args.charts, base_url=args.base_url or IMDB_BASE_URL)
+        print(f"Charts: {stats['charts']}, rows: {stats['rows']}, "
+              f"wall time: {stats['wall_time']:.2f}s, bytes: {stats['bytes']}")
+        for name, size in stats['bytes_per_chart'].items():
+            print(f"  {name}: {size} bytes")
+        if stats['failed']:
+            print(f"Failed or empty charts: {', '.join(stats['failed'])}")
+
     if args.analyze:
         print("Starting analysis...")
         df = load_and_clean_data()
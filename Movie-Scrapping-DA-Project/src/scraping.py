@@ -1,59 +1,166 @@
 
 # src/scraping.py
 
+import gzip
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import pandas as pd
 
-def scrape_imdb_top_250():
-    url = "https://www.imdb.com/chart/top"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept-Language': 'en-US,en;q=0.9'
+IMDB_BASE_URL = "https://www.imdb.com"
+
+# Shared by every request made through make_session()
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    # Only the encodings read_body() can decode
+    'Accept-Encoding': 'gzip, deflate'
+}
+
+# CSS selectors for the /chart/ pages
+CHART_SELECTORS = {
+    'item': 'li.ipc-metadata-list-summary-item',
+    'fallback': 'div[class*="cli-children"]',
+    'title': 'h3[class*="ipc-title__text"]',
+    'year': 'span[class*="cli-title-metadata-item"]',
+    'rating': 'span[class*="ipc-rating-star"]',
+}
+
+# Advanced search pages use dli-* classes instead of cli-*
+SEARCH_SELECTORS = {
+    'item': 'li.ipc-metadata-list-summary-item',
+    'fallback': 'div[class*="dli-children"]',
+    'title': 'h3[class*="ipc-title__text"]',
+    'year': 'span[class*="dli-title-metadata-item"]',
+    'rating': 'span[class*="ipc-rating-star"]',
+}
+
+GENRES = ['action', 'comedy', 'drama', 'horror', 'sci-fi']
+
+
+def _genre_chart(genre):
+    slug = genre.replace('-', '_')
+    return f'genre_{slug}', {
+        'path': f'/search/title/?genres={genre}&groups=top_250&sort=user_rating,desc',
+        'selectors': SEARCH_SELECTORS,
+        'output': f'data/imdb_top_{slug}_movies.csv',
     }
-    
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        print(f"Error fetching page: {e}")
-        return
 
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
+
+# Chart registry: name -> URL path, selectors and output partition.
+# Paths are joined onto a base URL so the batch can be pointed at a local server.
+CHARTS = {
+    'top': {
+        'path': '/chart/top',
+        'selectors': CHART_SELECTORS,
+        'output': 'data/imdb_top_250_movies.csv',
+    },
+    'top_tv': {
+        'path': '/chart/toptv',
+        'selectors': CHART_SELECTORS,
+        'output': 'data/imdb_top_250_tv.csv',
+    },
+    'most_popular': {
+        'path': '/chart/moviemeter',
+        'selectors': CHART_SELECTORS,
+        'output': 'data/imdb_most_popular_movies.csv',
+    },
+    'bottom_100': {
+        'path': '/chart/bottom',
+        'selectors': CHART_SELECTORS,
+        'output': 'data/imdb_bottom_100_movies.csv',
+    },
+    **dict(_genre_chart(genre) for genre in GENRES),
+}
+
+COMBINED_OUTPUT = 'data/imdb_charts.csv'
+
+
+def make_session(pool_size=10):
+    """Keep-alive session with a connection pool sized for concurrent fetches."""
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def chart_url(name, base_url=IMDB_BASE_URL):
+    return base_url.rstrip('/') + CHARTS[name]['path']
+
+
+def read_body(response):
+    """Read a streamed response, returning (decoded body, bytes on the wire).
+
+    The raw payload is read undecoded so gzip and chunked bodies are counted
+    at the size actually transferred.
+    """
+    raw = b''.join(response.raw.stream(8192, decode_content=False))
+    encoding = response.headers.get('Content-Encoding', 'identity').lower()
+    if encoding == 'gzip':
+        body = gzip.decompress(raw)
+    elif encoding == 'deflate':
+        try:
+            body = zlib.decompress(raw)
+        except zlib.error:
+            body = zlib.decompress(raw, -zlib.MAX_WBITS)
+    elif encoding == 'identity':
+        body = raw
+    else:
+        raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+    return body, len(raw)
+
+
+def parse_chart(html, chart=CHARTS['top']):
+    selectors = chart['selectors']
+    soup = BeautifulSoup(html, 'html.parser')
+
     # Primary selector for movie containers
-    movies = soup.select('li.ipc-metadata-list-summary-item')
-    
+    movies = soup.select(selectors['item'])
+
     if not movies:
         print("No movies found with primary selector. Trying fallback.")
-        movies = soup.find_all('div', class_=lambda x: x and 'cli-children' in x)
-    
+        movies = soup.select(selectors['fallback'])
+
     if not movies:
         print("No movies found. Check HTML selectors or page structure.")
         print("Dumping first 1000 characters of HTML for debugging:")
         print(soup.prettify()[:1000])
-        return
+        return []
 
     print(f"Found {len(movies)} movie elements")
 
     movie_data = []
-    for movie in movies:
+    for position, movie in enumerate(movies, start=1):
         try:
-            # Extract title (includes rank)
-            title_elem = movie.find('h3', class_=lambda x: x and 'ipc-title__text' in x)
+            # Extract title (includes rank on ranked charts)
+            title_elem = movie.select_one(selectors['title'])
             title_text = title_elem.text.strip() if title_elem else None
             if not title_text:
                 print("Skipping movie: No title found")
                 continue
-            rank = title_text.split('.')[0].strip()
-            name = title_text.split('. ')[1].strip() if '. ' in title_text else title_text
+            if re.match(r'^\d+\. ', title_text):
+                rank, name = title_text.split('. ', 1)
+                name = name.strip()
+            else:
+                # Unranked lists (e.g. Most Popular) fall back to page order
+                rank, name = str(position), title_text
 
-            # Extract year
-            metadata = movie.find_all('span', class_=lambda x: x and 'cli-title-metadata-item' in x)
-            year = metadata[0].text.strip() if metadata else None
+            # Extract year (TV series use ranges like "2008–2013")
+            metadata = movie.select(selectors['year'])
+            year_match = re.search(r'\d{4}', metadata[0].text) if metadata else None
+            year = year_match.group(0) if year_match else None
 
             # Extract rating
-            rating_elem = movie.find('span', class_=lambda x: x and 'ipc-rating-star' in x)
+            rating_elem = movie.select_one(selectors['rating'])
             if rating_elem and rating_elem.get('aria-label'):
                 # Parse aria-label like "IMDb rating 9.2"
                 rating_text = rating_elem.get('aria-label')
@@ -81,13 +188,118 @@ def scrape_imdb_top_250():
             print(f"Error processing movie: {e}")
             continue
 
+    return movie_data
+
+
+def scrape_imdb_top_250():
+    url = chart_url('top')
+
+    try:
+        response = requests.get(url, headers=DEFAULT_HEADERS)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Error fetching page: {e}")
+        return
+
+    movie_data = parse_chart(response.text, CHARTS['top'])
+
     if not movie_data:
         print("No valid data extracted. CSV will be empty.")
         return
 
+    output = CHARTS['top']['output']
     df = pd.DataFrame(movie_data)
-    df.to_csv('data/imdb_top_250_movies.csv', index=False)
-    print(f"Scraped {len(movie_data)} movies and saved to 'data/imdb_top_250_movies.csv'")
+    df.to_csv(output, index=False)
+    print(f"Scraped {len(movie_data)} movies and saved to '{output}'")
+
+
+def scrape_charts(names=None, base_url=IMDB_BASE_URL, output=COMBINED_OUTPUT,
+                  partitions=True, max_workers=8, per_host_limit=4, session=None):
+    """Fetch several charts concurrently and save one dataset tagged by chart.
+
+    With partitions=True each chart is also written to its registry 'output'
+    path. Returns a (DataFrame, stats) tuple; stats holds wall time, bytes
+    transferred (as sent on the wire) and the charts that failed or came
+    back empty.
+    """
+    names = list(names) if names else list(CHARTS)
+    unknown = [name for name in names if name not in CHARTS]
+    if unknown:
+        raise ValueError(f"Unknown chart(s): {', '.join(unknown)}")
+
+    own_session = session is None
+    if own_session:
+        session = make_session(pool_size=max(max_workers, per_host_limit))
+
+    host_limits = {}
+    host_limits_lock = threading.Lock()
+
+    def host_semaphore(url):
+        host = urlsplit(url).netloc
+        with host_limits_lock:
+            if host not in host_limits:
+                host_limits[host] = threading.BoundedSemaphore(per_host_limit)
+            return host_limits[host]
+
+    def fetch(name):
+        url = chart_url(name, base_url)
+        size = 0
+        try:
+            with host_semaphore(url):
+                with session.get(url, timeout=30, stream=True) as response:
+                    # Error bodies crossed the wire too, so count before raising
+                    body, size = read_body(response)
+            response.raise_for_status()
+            movie_data = parse_chart(body, CHARTS[name])
+        except requests.RequestException as e:
+            print(f"Error fetching chart {name}: {e}")
+            return name, None, size
+        except Exception as e:
+            print(f"Error parsing chart {name}: {e}")
+            return name, None, size
+        print(f"Fetched chart {name} ({size} bytes)")
+        return name, movie_data, size
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, names))
+    finally:
+        if own_session:
+            session.close()
+    elapsed = time.perf_counter() - start
+
+    frames = []
+    for name, movie_data, _ in results:
+        if not movie_data:
+            print(f"No valid data extracted for chart {name}.")
+            continue
+        chart_df = pd.DataFrame(movie_data)
+        if partitions:
+            chart_df.to_csv(CHARTS[name]['output'], index=False)
+        chart_df.insert(0, 'chart', name)
+        frames.append(chart_df)
+
+    columns = ['chart', 'rank', 'name', 'year', 'rating']
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    stats = {
+        'charts': len(names),
+        'rows': len(df),
+        'wall_time': elapsed,
+        'bytes': sum(size for _, _, size in results),
+        'bytes_per_chart': {name: size for name, _, size in results},
+        # Charts that errored or parsed to zero rows (e.g. stale selectors)
+        'failed': [name for name, movie_data, _ in results if not movie_data],
+    }
+
+    if output and frames:
+        df.to_csv(output, index=False)
+        print(f"Scraped {len(df)} rows from {len(frames)} charts and saved to '{output}'")
+    print(f"Batch finished in {elapsed:.2f}s, {stats['bytes']} bytes transferred")
+
+    return df, stats
+
 
 if __name__ == "__main__":
     scrape_imdb_top_250()
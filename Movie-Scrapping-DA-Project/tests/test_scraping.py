@@ -0,0 +1,190 @@
+# tests/test_scraping.py
+
+import gzip
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import scraping
+from scraping import CHARTS, scrape_charts
+
+ITEM = ('<li class="ipc-metadata-list-summary-item">'
+        '<h3 class="ipc-title__text">{title}</h3>'
+        '<span class="{prefix}-title-metadata-item">{year}</span>'
+        '<span class="ipc-rating-star ipc-rating-star--imdb" aria-label="IMDb rating {rating}"></span>'
+        '</li>')
+
+
+def page(*items, prefix='cli', padding=0):
+    body = ''.join(ITEM.format(prefix=prefix, title=t, year=y, rating=r) for t, y, r in items)
+    # Padding makes the gzipped body noticeably smaller than the decoded one
+    return f'<html><body><ul>{body}</ul><!--{"x" * padding}--></body></html>'.encode()
+
+
+PAGES = {
+    CHARTS['top']['path']: page(('1. The Shawshank Redemption', '1994', '9.3'),
+                                ('2. The Godfather', '1972', '9.2'), padding=20000),
+    CHARTS['top_tv']['path']: page(('1. Breaking Bad', '2008–2013', '9.5')),
+    CHARTS['most_popular']['path']: page(('Dune: Part Two', '2024', '8.5'),
+                                         ('Oppenheimer', '2023', '8.3')),
+    CHARTS['genre_drama']['path']: page(('1. 12 Angry Men', '1957', '9.0'), prefix='dli', padding=20000),
+    # Served fine but matches none of the selectors
+    CHARTS['genre_comedy']['path']: b'<html><body><p>Markup changed</p></body></html>',
+}
+GZIPPED = {CHARTS['top']['path'], CHARTS['genre_drama']['path']}
+CHUNKED = {CHARTS['genre_drama']['path']}
+ERROR_BODY = b'chart unavailable'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            server.clients.add(self.client_address)
+        try:
+            time.sleep(0.05)
+            body = PAGES.get(self.path)
+            status = 200 if body is not None else 500
+            if body is None:
+                body = ERROR_BODY
+            self.send_response(status)
+            if self.path in GZIPPED:
+                body = gzip.compress(body)
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            if self.path in CHUNKED:
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for i in range(0, len(body), 1024):
+                    chunk = body[i:i + 1024]
+                    self.wfile.write(f'{len(chunk):x}\r\n'.encode() + chunk + b'\r\n')
+                self.wfile.write(b'0\r\n\r\n')
+            else:
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            server.sent[self.path] = len(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class ScrapeChartsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        cls.server.lock = threading.Lock()
+        cls.server.daemon_threads = True
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.active = 0
+        self.server.peak = 0
+        self.server.sent = {}
+        self.server.clients = set()
+
+    def scrape(self, names, **kwargs):
+        kwargs.setdefault('output', None)
+        kwargs.setdefault('partitions', False)
+        return scrape_charts(names, base_url=self.base_url, **kwargs)
+
+    def test_combined_dataset_is_tagged_by_chart(self):
+        df, stats = self.scrape(['top', 'top_tv', 'most_popular', 'genre_drama'])
+
+        self.assertEqual(list(df.columns), ['chart', 'rank', 'name', 'year', 'rating'])
+        self.assertEqual(df.groupby('chart').size().to_dict(),
+                         {'top': 2, 'top_tv': 1, 'most_popular': 2, 'genre_drama': 1})
+        self.assertEqual(stats['failed'], [])
+
+    def test_unranked_chart_uses_page_order(self):
+        df, _ = self.scrape(['most_popular'])
+
+        self.assertEqual(df['rank'].tolist(), [1, 2])
+        self.assertEqual(df['name'].tolist(), ['Dune: Part Two', 'Oppenheimer'])
+
+    def test_tv_year_range_keeps_first_year(self):
+        df, _ = self.scrape(['top_tv'])
+
+        self.assertEqual(df.loc[0, 'year'], 2008)
+
+    def test_failing_chart_is_skipped(self):
+        df, stats = self.scrape(['top', 'bottom_100'])
+
+        self.assertEqual(set(df['chart']), {'top'})
+        self.assertEqual(stats['failed'], ['bottom_100'])
+
+    def test_empty_chart_is_reported_as_failed(self):
+        df, stats = self.scrape(['top', 'genre_comedy'])
+
+        self.assertEqual(set(df['chart']), {'top'})
+        self.assertEqual(stats['failed'], ['genre_comedy'])
+
+    def test_parse_error_does_not_abort_batch(self):
+        broken = dict(CHARTS['top_tv'], selectors=dict(CHARTS['top_tv']['selectors'], item='li[['))
+        original = CHARTS['top_tv']
+        CHARTS['top_tv'] = broken
+        try:
+            df, stats = self.scrape(['top', 'top_tv'])
+        finally:
+            CHARTS['top_tv'] = original
+
+        self.assertEqual(set(df['chart']), {'top'})
+        self.assertEqual(stats['failed'], ['top_tv'])
+
+    def test_per_host_limit_and_connection_reuse(self):
+        names = ['top', 'top_tv', 'most_popular', 'genre_drama', 'bottom_100']
+        self.scrape(names, max_workers=5, per_host_limit=2)
+
+        self.assertEqual(self.server.peak, 2)
+        # Five requests over keep-alive connections, never more than the limit
+        self.assertLessEqual(len(self.server.clients), 2)
+
+    def test_bytes_are_counted_on_the_wire(self):
+        df, stats = self.scrape(['top', 'genre_drama', 'bottom_100'])
+
+        sent = self.server.sent
+        # Gzipped with Content-Length, and gzipped with chunked transfer
+        for name in ['top', 'genre_drama']:
+            path = CHARTS[name]['path']
+            self.assertEqual(stats['bytes_per_chart'][name], sent[path])
+            self.assertLess(stats['bytes_per_chart'][name], len(PAGES[path]))
+        self.assertEqual(set(df['chart']), {'top', 'genre_drama'})
+        self.assertEqual(stats['bytes_per_chart']['bottom_100'], len(ERROR_BODY))
+        self.assertEqual(stats['bytes'], sum(sent.values()))
+
+    def test_partitions_written_per_chart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            os.mkdir('data')
+            try:
+                self.scrape(['top', 'top_tv'], output=scraping.COMBINED_OUTPUT, partitions=True)
+                written = sorted(os.listdir('data'))
+            finally:
+                os.chdir(cwd)
+
+        self.assertEqual(written, ['imdb_charts.csv', 'imdb_top_250_movies.csv', 'imdb_top_250_tv.csv'])
+
+
+if __name__ == "__main__":
+    unittest.main()